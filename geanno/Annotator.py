@@ -5,6 +5,11 @@ import os
 import numpy as np
 
 class GenomicRegionAnnotator():
+    # Valid values of the optional ANNOTATION.MODE database column. LABEL is
+    # the default, all other modes store numeric aggregates.
+    __aggregate_annotation_modes = ["COUNT", "MIN.DISTANCE", "COVERAGE"]
+    __annotation_modes = ["LABEL"]+__aggregate_annotation_modes
+
     #############################
     # Constructors/ Destructors #
     #############################
@@ -24,6 +29,8 @@ class GenomicRegionAnnotator():
         # be defined what the location is to which the distance shall
         # be computed. Can be START | END | MID | REGION
         # N.HITS: Van be either of ALL | CLOSEST
+        # ANNOTATION.MODE (optional): LABEL | COUNT | MIN.DISTANCE |
+        # COVERAGE. Defaults to LABEL.
         self.__database = None
 
         # Set regions that shall be annotated to None.
@@ -66,6 +73,18 @@ computed. Can be START | END | MID | REGION.
 column (0-based) in which the name is stored. If NAME.COL == NA, then it is \
 assumed, that the 4th column contains the name.
 
+            Optional columns are
+
+            - ANNOTATION.MODE: LABEL | COUNT | MIN.DISTANCE | COVERAGE. \
+LABEL (default) annotates "name(distance)" strings. COUNT stores the number \
+of database intervals within MAX.DISTANCE (at most N.HITS, plus ties), \
+MIN.DISTANCE the signed distance of the closest database interval within \
+MAX.DISTANCE (NA if there is none; negative if the database interval lies \
+upstream of the base interval, upstream wins ties), and COVERAGE the fraction of base pairs \
+of the base interval overlapped by database intervals (DISTANCE.TO, \
+MAX.DISTANCE and N.HITS are ignored). Entries with an \
+aggregate ANNOTATION.MODE must have a distinct REGION.TYPE.
+
         :type database_filename: str
 
         :return: Nothing to be returned
@@ -100,6 +119,18 @@ computed. Can be START | END | MID | REGION.
             - NAME.COL: If ANNOTATION.BY == NAME, then you can define the \
 column (0-based) in which the name is stored. If NAME.COL == NA, then it is \
 assumed, that the 4th column contains the name.
+
+            Optional columns are
+
+            - ANNOTATION.MODE: LABEL | COUNT | MIN.DISTANCE | COVERAGE. \
+LABEL (default) annotates "name(distance)" strings. COUNT stores the number \
+of database intervals within MAX.DISTANCE (at most N.HITS, plus ties), \
+MIN.DISTANCE the signed distance of the closest database interval within \
+MAX.DISTANCE (NA if there is none; negative if the database interval lies \
+upstream of the base interval, upstream wins ties), and COVERAGE the fraction of base pairs \
+of the base interval overlapped by database intervals (DISTANCE.TO, \
+MAX.DISTANCE and N.HITS are ignored). Entries with an \
+aggregate ANNOTATION.MODE must have a distinct REGION.TYPE.
         :type database_dataframe: :class:`pandas.DataFrame`
 
         :return: Nothing to be returned
@@ -197,12 +228,27 @@ assumed, that the 4th column contains the name.
             distance_to = row["DISTANCE.TO"]
             name_col = (row["NAME.COL"] if row["NAME.COL"] == "NA" else 
                         int(row["NAME.COL"]))
+            annotation_mode = self.__get_annotation_mode(row)
 
             print(filename)
 
             # Check if annotation was already done
-            if(self.__anno_done(region_type, current_source, annotation_by)):
+            if(self.__anno_done(region_type, current_source, annotation_by,
+                                annotation_mode=annotation_mode)):
                 continue
+            elif(not annotation_mode == "LABEL"):
+                # COVERAGE is always computed on the full database intervals
+                anno_bed = self.__create_bed6(filename,
+                                              ("REGION" if annotation_mode ==
+                                               "COVERAGE" else distance_to),
+                                              annotation_by,
+                                              source=current_source,
+                                              name_col=name_col)
+                self.__annotate_aggregate(anno_bed,
+                                          region_type,
+                                          annotation_mode,
+                                          max_distance,
+                                          n_hits)
             else:
                 if(not region_type in self.__base.columns):
                     # Initiate new column if self.__base with "NA"
@@ -333,12 +379,27 @@ assumed, that the 4th column contains the name.
                 if(not(os.path.exists(filename))):
                     raise(RuntimeError(filename+" does not exist!"))
 
+        # Check if ANNOTATION.MODE values are valid
+        for index, row in self.__database.iterrows():
+            annotation_mode = self.__get_annotation_mode(row)
+            if(not annotation_mode in self.__annotation_modes):
+                raise(RuntimeError((
+                    "Invalid ANNOTATION.MODE ("+annotation_mode+") for "
+                    "REGION.TYPE "+str(row["REGION.TYPE"])+"! ANNOTATION.MODE "
+                    "must be either of "+" | ".join(self.__annotation_modes)+
+                    ".")))
+
         # Check if there are many entries for the same REGION.TYPE, that in 
         # this case ANNOTATION.BY has to be SOURCE in all cases.
         region_type_dict = {}
         for index, row in self.__database.iterrows():
             region_type = row["REGION.TYPE"]
             annotation_by = row["ANNOTATION.BY"]
+            annotation_mode = self.__get_annotation_mode(row)
+            # Aggregated annotations are numeric and can therefore not be
+            # combined with other entries of the same REGION.TYPE.
+            if(not annotation_mode == "LABEL"):
+                annotation_by = annotation_mode
 
             if(not region_type in region_type_dict):
                 region_type_dict[region_type] = [annotation_by]
@@ -346,7 +407,18 @@ assumed, that the 4th column contains the name.
                 region_type_dict[region_type] += [annotation_by]
 
         for region_type in region_type_dict.keys():
-            if(region_type_dict[region_type].count("NAME") > 1):
+            if((len(region_type_dict[region_type]) > 1) and
+               (len(set(region_type_dict[region_type]) &
+                    set(self.__aggregate_annotation_modes)) > 0)):
+                raise(RuntimeError((
+                    "Database contains more than one entry with the "
+                    "same REGION.TYPE ("+region_type+"), while ANNOTATION.MODE "
+                    "is set to an aggregate mode ("
+                    +" | ".join(self.__aggregate_annotation_modes)+"). Please "
+                    "define "
+                    "a distinct \"REGION.TYPE\" ID for each aggregated "
+                    "annotation!")))
+            elif(region_type_dict[region_type].count("NAME") > 1):
                 raise(RuntimeError((
                     "Database contains more than one entry with the "
                     "same REGION.TYPE ("+region_type+"), while ANNOTATION.BY " 
@@ -522,7 +594,8 @@ assumed, that the 4th column contains the name.
         else:
             return False
 
-    def __anno_done(self, region_type, source, annotation_by):
+    def __anno_done(self, region_type, source, annotation_by,
+                    annotation_mode="LABEL"):
         '''Method that checks if annotation is already done for region_type, 
         source, annotation_by combo.
 
@@ -532,12 +605,18 @@ assumed, that the 4th column contains the name.
         :type source: str
         :annotation_by: annotation_by as given in self.__database. Can be either
             of SOURCE | NAME
+        :param annotation_mode: annotation_mode as given in self.__database. Can
+            be either of LABEL | COUNT | MIN.DISTANCE | COVERAGE
+        :type annotation_mode: str
 
         :return: True, if the annotation was already performed, False otherwise.
         :rtype: bool
         '''
         if(not region_type in set(self.__base.columns)):
             return False
+        elif(not annotation_mode == "LABEL"):
+            # Aggregated REGION.TYPEs are unique in the database
+            return True
         elif( annotation_by == "SOURCE" ):
             sources = sum([ e.split(";") for e in 
                             self.__base.loc[:, region_type] ], [])
@@ -549,6 +628,98 @@ assumed, that the 4th column contains the name.
         else:
             return True
 
+    def __get_annotation_mode(self, row):
+        '''Method that returns the ANNOTATION.MODE of a database entry.
+
+        :param row: Row of self.__database
+        :type row: :class:`pandas.Series`
+
+        :return: ANNOTATION.MODE of row. LABEL, if the column is not defined or
+            NA.
+        :rtype: str
+        '''
+        if(not "ANNOTATION.MODE" in row.index):
+            return "LABEL"
+        elif(pnd.isna(row["ANNOTATION.MODE"])):
+            return "LABEL"
+        annotation_mode = str(row["ANNOTATION.MODE"])
+        if(annotation_mode in ["NA", ""]):
+            return "LABEL"
+        return annotation_mode
+
+    def __annotate_aggregate(self,
+                             anno_bed,
+                             region_type,
+                             annotation_mode,
+                             max_distance,
+                             n_hits):
+        '''Method that annotates a numeric aggregate of the database
+        intervals in anno_bed to self.__base, instead of "name(distance)"
+        strings.
+
+        :param anno_bed: Database intervals as created by __create_bed6
+        :type anno_bed: :class:`pybedtools.BedTool`
+        :param region_type: Column of self.__base, that will hold the aggregate
+        :type region_type: str
+        :param annotation_mode: Can be either of COUNT | MIN.DISTANCE | 
+            COVERAGE
+        :type annotation_mode: str
+        :param max_distance: Maximal distance between base and database
+            intervall. Not used for COVERAGE.
+        :type max_distance: int
+        :param n_hits: Number of closest database intervals considered per
+            base intervall. Only used for COUNT.
+        :type n_hits: int
+
+        :return: Nothing to be returned.
+        :rtype: None
+        '''
+        if(annotation_mode == "COVERAGE"):
+            # bedtools coverage appends number of overlaps, number of covered
+            # bases, length and covered fraction to each base intervall
+            coverage_df = self.__base_bed.coverage(anno_bed).to_dataframe(
+                header=None,
+                names=["chrom", "start", "end", "name", "n.overlaps",
+                       "n.covered", "length", "fraction"],
+                dtype={"name": str})
+            aggregate_series = coverage_df.groupby("name")["fraction"].first(
+                ).astype("float64")
+            fill_value = 0.
+        else:
+            # Only the closest database intervals (including ties) are needed
+            # for MIN.DISTANCE
+            k = int(n_hits) if annotation_mode == "COUNT" else 1
+            closest_df = self.__base_bed.sort().closest(anno_bed.sort(),
+                                                        D="ref",
+                                                        k=k,
+                                                        t="all"
+                                                       ).to_dataframe(
+                header=None,
+                names=["chrom", "start", "end", "name", "db.chrom",
+                       "db.start", "db.end", "db.name", "db.score",
+                       "db.strand", "distance"],
+                dtype={"name": str, "db.chrom": str})
+            # Remove base intervals without database intervall on the same
+            # chromosome, and hits further away than max_distance
+            closest_df = closest_df[(closest_df["db.chrom"] != ".") &
+                                    (closest_df["distance"].abs() <=
+                                     max_distance)]
+            if(annotation_mode == "COUNT"):
+                aggregate_series = closest_df.groupby("name").size().astype(
+                    "int64")
+                fill_value = 0
+            else:
+                # All remaining hits are equally close. If an upstream and a
+                # downstream hit are tied, the upstream (negative) distance
+                # is reported.
+                aggregate_series = closest_df.groupby("name")["distance"].min(
+                    ).astype("Int64")
+                fill_value = pnd.NA
+
+        self.__base[region_type] = aggregate_series.reindex(
+                                       self.__base.index,
+                                       fill_value=fill_value).values
+
     def __calculate_distance(self, e):
         '''Method that calculates the distance between two intervalls.
 
@@ -0,0 +1,132 @@
+import pandas as pnd
+import pytest
+import geanno
+
+
+BASE_LINES = [
+    "#chrom\tstart\tend",
+    "1\t100\t200",     # two overlapping database intervals
+    "1\t1000\t1100",   # one hit within, one outside MAX.DISTANCE
+    "2\t100\t200"]     # no database intervals on chromosome
+
+DB_LINES = [
+    "1\t90\t120",
+    "1\t150\t250",
+    "1\t1150\t1160",
+    "1\t5000\t5100"]
+
+
+def write_file(path, lines):
+    path.write_text("\n".join(lines)+"\n")
+    return str(path)
+
+
+def create_database(db_filename, region_types, annotation_modes,
+                    distance_to="REGION"):
+    n = len(region_types)
+    return pnd.DataFrame({
+        "FILENAME": [db_filename]*n,
+        "REGION.TYPE": region_types,
+        "SOURCE": ["DB"]*n,
+        "ANNOTATION.BY": ["SOURCE"]*n,
+        "MAX.DISTANCE": [100]*n,
+        "DISTANCE.TO": [distance_to]*n,
+        "N.HITS": [2]*n,
+        "NAME.COL": ["NA"]*n,
+        "ANNOTATION.MODE": annotation_modes})
+
+
+def annotate(base_filename, database):
+    gra = geanno.Annotator.GenomicRegionAnnotator()
+    gra.load_base_from_file(base_filename)
+    gra.load_database_from_dataframe(database)
+    gra.annotate()
+    return gra.get_base()
+
+
+def test_aggregate_annotation_modes(tmp_path):
+    base_filename = write_file(tmp_path / "base.bed", BASE_LINES)
+    db_filename = write_file(tmp_path / "db.bed", DB_LINES)
+
+    database = create_database(
+        db_filename,
+        ["DB.count", "DB.distance", "DB.coverage", "DB"],
+        ["COUNT", "MIN.DISTANCE", "COVERAGE", None])
+    base = annotate(base_filename, database)
+
+    assert base["DB.count"].dtype == "int64"
+    assert base["DB.count"].tolist() == [2, 1, 0]
+
+    assert base["DB.distance"].dtype == "Int64"
+    assert base["DB.distance"].iloc[0] == 0
+    assert base["DB.distance"].iloc[1] == 51
+    assert pnd.isna(base["DB.distance"].iloc[2])
+
+    assert base["DB.coverage"].dtype == "float64"
+    assert base["DB.coverage"].tolist() == [0.7, 0., 0.]
+
+    # Missing ANNOTATION.MODE falls back to LABEL
+    assert base.loc["1_100_200", "DB"] == "DB(0);DB(0)"
+
+
+def test_min_distance_tie_reports_upstream(tmp_path):
+    base_filename = write_file(tmp_path / "base.bed", [
+        "#chrom\tstart\tend",
+        "1\t1000\t1100"])
+    db_filename = write_file(tmp_path / "db.bed", [
+        "1\t940\t950",
+        "1\t1150\t1160"])
+
+    database = create_database(db_filename, ["DB.distance"],
+                               ["MIN.DISTANCE"])
+    base = annotate(base_filename, database)
+
+    assert base["DB.distance"].tolist() == [-51]
+
+
+def test_coverage_ignores_distance_to(tmp_path):
+    base_filename = write_file(tmp_path / "base.bed", BASE_LINES)
+    db_filename = write_file(tmp_path / "db.bed", DB_LINES)
+
+    database = create_database(db_filename, ["DB.coverage"], ["COVERAGE"],
+                               distance_to="START")
+    base = annotate(base_filename, database)
+
+    assert base["DB.coverage"].tolist() == [0.7, 0., 0.]
+
+
+def test_missing_annotation_mode_from_file(tmp_path):
+    base_filename = write_file(tmp_path / "base.bed", BASE_LINES)
+    db_filename = write_file(tmp_path / "db.bed", DB_LINES)
+    database_filename = str(tmp_path / "database.tsv")
+    database = create_database(db_filename, ["DB.a", "DB.b", "DB.count"],
+                               ["", "NA", "COUNT"])
+    database.to_csv(database_filename, sep="\t", index=False)
+
+    gra = geanno.Annotator.GenomicRegionAnnotator()
+    gra.load_base_from_file(base_filename)
+    gra.load_database_from_file(database_filename)
+    gra.annotate()
+    base = gra.get_base()
+
+    assert base.loc["1_100_200", "DB.a"] == "DB(0);DB(0)"
+    assert base.loc["1_100_200", "DB.b"] == "DB(0);DB(0)"
+    assert base["DB.count"].tolist() == [2, 1, 0]
+
+
+def test_invalid_annotation_mode(tmp_path):
+    db_filename = write_file(tmp_path / "db.bed", DB_LINES)
+    database = create_database(db_filename, ["DB"], ["SUM"])
+
+    gra = geanno.Annotator.GenomicRegionAnnotator()
+    with pytest.raises(RuntimeError):
+        gra.load_database_from_dataframe(database)
+
+
+def test_shared_aggregate_region_type(tmp_path):
+    db_filename = write_file(tmp_path / "db.bed", DB_LINES)
+    database = create_database(db_filename, ["DB", "DB"], ["COUNT", None])
+
+    gra = geanno.Annotator.GenomicRegionAnnotator()
+    with pytest.raises(RuntimeError):
+        gra.load_database_from_dataframe(database)